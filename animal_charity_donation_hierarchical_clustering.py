@@ -32,11 +32,13 @@ Date: November 2025
 # Import modules
 import pandas as pd
 import numpy as np
-import gower
-from scipy.cluster.hierarchy import linkage, dendrogram, fcluster
+import hashlib
+import os
+import fastcluster
+from numba import njit, prange
+from joblib import Parallel, delayed
+from scipy.cluster.hierarchy import dendrogram, fcluster
 import matplotlib.pyplot as plt
-from scipy.spatial.distance import squareform
-from sklearn.metrics import silhouette_score
 
 # To make the code reproducable
 np.random.seed(42)
@@ -68,16 +70,60 @@ data_clust = data_full.drop(columns=['donor_id'])
 # 3. Ensure booleans are actual bool
 data_clust["newsletter_opt_in"] = data_clust["newsletter_opt_in"].astype(bool)
 
-# --- Compute Gower distance matrix ---
+# --- Compute Gower distance ---
+
+# Split the features into numeric and categorical (label-encoded) arrays.
+# As in the gower package, anything that isn't a number (including bools and dates) is categorical.
+num_cols = data_clust.select_dtypes(include='number').columns
+cat_cols = data_clust.columns.difference(num_cols)
+
+num_arr = data_clust[num_cols].to_numpy(np.float32)
+cat_arr = pd.DataFrame({c: data_clust[c].astype('category').cat.codes for c in cat_cols}).to_numpy(np.int32)
+ranges = np.nanmax(num_arr, axis=0) - np.nanmin(num_arr, axis=0)
+
+@njit(parallel=True, fastmath=True)
+def gower_condensed(num, cat, ranges):
+    """Gower distance between every pair of rows, written straight into condensed form"""
+    n = num.shape[0]
+    n_features = num.shape[1] + cat.shape[1]
+    out = np.empty(n * (n - 1) // 2, dtype=np.float32) # Gower distances lie in [0, 1], so float32 is ample
+
+    for i in prange(n - 1):
+        # Position of pair (i, j) in the condensed vector is offset + j
+        offset = i * n - i * (i + 1) // 2 - i - 1
+
+        for j in range(i + 1, n):
+            d = 0.0
+            for c in range(num.shape[1]):
+                if ranges[c] > 0:
+                    d += abs(num[i, c] - num[j, c]) / ranges[c]
+            for c in range(cat.shape[1]):
+                if cat[i, c] != cat[j, c]:
+                    d += 1.0
+            out[offset + j] = d / n_features
+
+    return out
+
+# SciPy-style linkage expects a condensed (upper triangle) distance vector,
+# so it is produced directly rather than converted from a square matrix.
+# The result is cached on disk, keyed on a hash of the input data, so reruns skip the Gower pass.
+# The key also covers the column dtypes (they decide the numeric/categorical split) and a version tag -
+# bump GOWER_CACHE_VERSION whenever gower_condensed changes so stale caches are never reused.
+GOWER_CACHE_VERSION = 1
+cache_hash = hashlib.sha1(f"v{GOWER_CACHE_VERSION}:{list(data_clust.dtypes.items())!r}".encode())
+cache_hash.update(pd.util.hash_pandas_object(data_clust, index=False).values.tobytes())
+cache_key = cache_hash.hexdigest()[:16]
+cache_path = f"cache/gower_{cache_key}.f32.mmap"
+n_pairs = len(data_clust) * (len(data_clust) - 1) // 2
+
+if os.path.exists(cache_path):
+    distance_condensed = np.memmap(cache_path, dtype=np.float32, mode='r', shape=(n_pairs,))
+else:
+    distance_condensed = gower_condensed(num_arr, cat_arr, ranges)
+    os.makedirs("cache", exist_ok=True)
+    distance_condensed.tofile(cache_path + ".tmp")
+    os.replace(cache_path + ".tmp", cache_path) # Only a complete file ever appears under the cache name
 
-distance_matrix = gower.gower_matrix(data_clust)
-print(distance_matrix)
-
-# --- Convert full distance matrix to condensed form ---
-
-# SciPy’s linkage expects a condensed (upper triangle) distance vector.
-# SciPy needs condensed form, but Gower returns a square matrix.
-distance_condensed = squareform(distance_matrix, checks=False)
 print(distance_condensed)
 
 # --- Perform hierarchical clustering ---
@@ -87,7 +133,10 @@ print(distance_condensed)
 # - "complete" (max distance)
 # - "single" (not recommended — chaining)
 # - "weighted"
-Z = linkage(distance_condensed, method='average')
+# fastcluster's linkage is a drop-in for SciPy's (same Z format) but runs in O(N^2) for these methods.
+# preserve_input=True because the silhouette analysis reads distance_condensed afterwards.
+# Linkage works in float64, so the float32 distances are promoted once here and nowhere else.
+Z = fastcluster.linkage(distance_condensed, method='average', preserve_input=True)
 
 # --- Plot dendrogram ---
 
@@ -100,19 +149,57 @@ plt.show()
 
 # --- Silhouette Score for Gower Distance ---
 
-# Function to compute silhouette score for any number of clusters
-def silhouette_for_k(Z, distance_matrix, k):
-    clusters = fcluster(Z, k, criterion='maxclust')
-    score = silhouette_score(distance_matrix, clusters, metric='precomputed')
-    return score
-
-# Try several values of k - Generally 2-10 clusters
-
-scores = {}
-
-for k in range(2, 11):
-    score = silhouette_for_k(Z, distance_matrix, k)
-    scores[k] = score
+# Assign clusters for every candidate k up front - Generally 2-10 clusters
+k_values = range(2, 11)
+labels_by_k = {k: fcluster(Z, k, criterion='maxclust') for k in k_values}
+
+# Function to sum the distances from every sample to every cluster
+@njit(nogil=True)
+def cluster_row_sums(cond, label_idx, n_clusters):
+    """Per-cluster row sums of the distance matrix, read straight from its condensed form"""
+    n = len(label_idx)
+    S = np.zeros((n, n_clusters))
+    pos = 0
+
+    # Each pair (i, j) appears once in the condensed vector, so credit it to both rows
+    for i in range(n - 1):
+        for j in range(i + 1, n):
+            d = cond[pos]
+            S[i, label_idx[j]] += d
+            S[j, label_idx[i]] += d
+            pos += 1
+
+    return S
+
+# Function to compute the mean silhouette score from a condensed distance vector
+def fast_silhouette(cond, labels):
+    """Mean silhouette score built from per-cluster row sums of the distance matrix"""
+    cluster_ids, label_idx = np.unique(labels, return_inverse=True)
+    n = len(labels)
+
+    # Sum of distances from every sample to every cluster (one pass over cond), and cluster sizes
+    onehot = label_idx[:, None] == np.arange(len(cluster_ids))
+    S = cluster_row_sums(cond, label_idx, len(cluster_ids))
+    C = onehot.sum(axis=0)
+
+    # a: mean distance to the other members of the sample's own cluster
+    own_count = C[label_idx]
+    a = S[np.arange(n), label_idx] / np.maximum(own_count - 1, 1)
+
+    # b: mean distance to the members of the nearest other cluster
+    b = np.min(np.where(onehot, np.inf, S / C), axis=1)
+
+    sil = np.nan_to_num((b - a) / np.maximum(a, b))
+    sil[own_count == 1] = 0 # Singleton clusters score 0, as in sklearn's silhouette_score
+    return sil.mean()
+
+# Score every k in parallel. Threads are enough because cluster_row_sums releases the GIL
+results = Parallel(n_jobs=-1, backend='threading')(
+    delayed(fast_silhouette)(distance_condensed, labels_by_k[k]) for k in k_values
+)
+scores = dict(zip(k_values, results))
+
+for k, score in scores.items():
     print(f"k={k}, silhouette={score:.4f}")
 
 # Find the best k
@@ -130,7 +217,7 @@ plt.show()
 # --- Choose number of clusters and assign them ---
 
 k = 5 # Although best_k is 2, 5 is more useful
-clusters = fcluster(Z, k, criterion='maxclust')
+clusters = labels_by_k[k]
 
 # Add clusters back into the dataset:
 data_full['cluster'] = clusters
@@ -161,15 +248,21 @@ plt.show()
 
 # --- Get cluster profiles ---
 
+# Function to find the most common value of a column in every cluster
+def cluster_mode(df, col):
+    """Most frequent value of col within each cluster, from a single grouped count"""
+    counts = df.groupby(['cluster', col]).size().reset_index(name='n')
+    counts = counts.sort_values('n', ascending=False, kind='stable').drop_duplicates('cluster')
+    return counts.set_index('cluster')[col].sort_index()
+
 cluster_profiles = data_full.groupby('cluster').agg({
     'donation_amount': ['mean', 'median'],
-    'gender': lambda x: x.value_counts().index[0],
-    'age_group': lambda x: x.value_counts().index[0],
-    'country': lambda x: x.value_counts().index[0],
-    'donation_type': lambda x: x.value_counts().index[0],
     'newsletter_opt_in': 'mean'
 })
 
+for col in ['gender', 'age_group', 'country', 'donation_type']:
+    cluster_profiles[(col, 'mode')] = cluster_mode(data_full, col)
+
 cluster_profiles
 
 cluster_data = data_full.groupby('cluster').agg({
@@ -184,16 +277,19 @@ cluster_data
 # --- Create a radar chart ---
 
 # Min-max scale each column to 0-1
-cluster_data_scaled = (cluster_data - cluster_data.min()) / (cluster_data.max() - cluster_data.min())
+cluster_arr = cluster_data.to_numpy(dtype=float)
+cluster_data_scaled = pd.DataFrame(
+    (cluster_arr - cluster_arr.min(axis=0)) / np.ptp(cluster_arr, axis=0),
+    index=cluster_data.index,
+    columns=cluster_data.columns
+)
 print(cluster_data_scaled.describe())
 
-# Convert to dictionary for the radar chart loop
-cluster_data_scaled = {
-    cluster: cluster_data_scaled.loc[cluster].tolist()
-    for cluster in cluster_data_scaled.index
-}
+# Convert to an array for the radar chart loop, repeating the first column to complete the loop
+radar_values = cluster_data_scaled.to_numpy()
+radar_values = np.hstack([radar_values, radar_values[:, :1]])
 
-cluster_data_scaled
+radar_values
 
 num_vars = cluster_data.shape[1]
 num_vars
@@ -204,10 +300,9 @@ angles
 
 fig, ax = plt.subplots(figsize=(6, 6), subplot_kw=dict(polar=True))
 
-for cluster, values in cluster_data_scaled.items():
-    values += values[:1] # complete the loop
-    ax.plot(angles, values, linewidth = 1, label = cluster)
-    ax.fill(angles, values, alpha = 0.15)
+for i, cluster in enumerate(cluster_data_scaled.index):
+    ax.plot(angles, radar_values[i], linewidth = 1, label = cluster)
+    ax.fill(angles, radar_values[i], alpha = 0.15)
 
 ax.set_xticks(angles[:-1])
 ax.set_xticklabels(cluster_data.columns)
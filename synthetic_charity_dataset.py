@@ -21,7 +21,6 @@ import pandas as pd
 import numpy as np
 from faker import Faker
 from datetime import date
-import random
 import matplotlib.pyplot as plt
 import matplotlib.ticker as mtick
 
@@ -30,7 +29,6 @@ fake = Faker()
 
 # Set seed for reproducibility
 Faker.seed(42) 
-random.seed(42)
 np.random.seed(42)
 
 # Configuration
@@ -43,37 +41,40 @@ years = list(range(start_date.year, end_date.year + 1, 1)) # Extract years
 def generate_contacts_with_signals(n):
     """Generate a contact dataframe with age signals"""
 
-    contacts = [] # Initialize a contacts list
-    
-    for i in range(n):
-
-        # Generate basic demographics
-        age = random.randint(18, 90)
-        gender = np.random.choice(['F', 'M', 'Non-binary'], p=[0.52, 0.45, 0.03])
-        name = fake.name_male() if gender == 'M' else fake.name_female() if gender == 'F' else fake.name_nonbinary()
-        
-        # Bake in the signal:
-        # Make "Major Donor" status dependent on age
-        major_prob = 0.001 + (age / 100) * 0.05
-        is_major = random.random() < major_prob
-        
-        # Make "Regular Donor" status inversely dependent on age
-        reg_prob = 0.40 - (age / 100) * 0.30
-        is_regular = random.random() < reg_prob
-
-        contacts.append({
-            'contact_id': f"003{str(i+1).zfill(12)}", # Put "003" at the beginning simply to imitate Salesforce Contact IDs
-            'age': age,
-            'gender': gender,
-            'name': name,
-            'is_major': is_major,
-            'is_regular': is_regular
-        })
-
-    return pd.DataFrame(contacts)
+    # Generate basic demographics for everyone at once
+    ages = np.random.randint(18, 91, size=n)
+    genders = np.random.choice(['F', 'M', 'Non-binary'], size=n, p=[0.52, 0.45, 0.03])
+
+    # Generate the names in one batch per gender, then put them back in place
+    names = np.empty(n, dtype=object)
+    for gender, name_generator in [('F', fake.name_female), ('M', fake.name_male), ('Non-binary', fake.name_nonbinary)]:
+        is_gender = genders == gender
+        names[is_gender] = [name_generator() for _ in range(is_gender.sum())]
+
+    # Bake in the signal:
+    # Make "Major Donor" status dependent on age
+    major_prob = 0.001 + (ages / 100) * 0.05
+    is_major = np.random.random(n) < major_prob
+
+    # Make "Regular Donor" status inversely dependent on age
+    reg_prob = 0.40 - (ages / 100) * 0.30
+    is_regular = np.random.random(n) < reg_prob
+
+    return pd.DataFrame({
+        'contact_id': np.char.add("003", np.char.zfill(np.arange(1, n + 1).astype(str), 12)), # Put "003" at the beginning simply to imitate Salesforce Contact IDs
+        'age': ages,
+        'gender': genders,
+        'name': names,
+        'is_major': is_major,
+        'is_regular': is_regular
+    })
 
 df_contacts = generate_contacts_with_signals(num_contacts)
 
+# Store the ID and gender columns as categories so downstream code can work with integer codes
+df_contacts['contact_id'] = df_contacts['contact_id'].astype('category')
+df_contacts['gender'] = df_contacts['gender'].astype('category')
+
 print(df_contacts.head())
 
 # --- Generate Regular Donor Contact Records ---
@@ -88,57 +89,41 @@ all_months_weights = monthly_weights * len(years)
 # Convert weights to probabilities
 probabilities = np.array(all_months_weights) / sum(all_months_weights)
 
-# Create a list of all possible (Year, Month) starting points
-
-month_options = [] # Initialize a month_options list
-
-for year in years:
-    for month in range(1, 13):
-        month_options.append((year, month))
+# Create an array of all possible (Year, Month) starting points
+month_options = np.arange(np.datetime64(f"{years[0]}-01"), np.datetime64(f"{years[-1]}-12") + 1)
 
-# Get a list and number of regular donor IDs
-regular_contact_ids = df_contacts[df_contacts['is_regular'] == True]['contact_id'].tolist()
+# Get an array and number of regular donor IDs
+regular_contact_ids = df_contacts.loc[df_contacts['is_regular'], 'contact_id'].to_numpy()
 num_regular = len(regular_contact_ids)
 
 # Assign a start month to every single regular donor at once
 chosen_start_points = np.random.choice(len(month_options), size=num_regular, p=probabilities)
 
-# Create regular donor records
-regular_donors = [] # Initialize a regular_donors list
+# Calculate the number of months left between each start and the very end (31 Dec 2025)
+max_possible_months = len(month_options) - chosen_start_points
 
-for i, start_idx in enumerate(chosen_start_points):
+# The "logarithmic decay": fast at first, slow later
+# drop_prob[m-2] is the chance of cancelling in month m (m = 2, 3, ...)
+drop_prob = 0.15 / (1 + np.log(np.arange(1, len(month_options))))
+# This mimics real-life behavior where a donor is most likely to quit early on, but if they stay for a long time, their chance of leaving each month becomes much smaller
 
-    cid = regular_contact_ids[i] # Pick a donor
-    year, month = month_options[start_idx] # Pick the first-gift month
-    start_dt = date(year, month, 1) # Pick the first-gift date
-    
-    months_stayed = 1 # Initialize to 1 (the first month donors give)
-
-    # Calculate the number of months left between start and the very end (31 Dec 2025)
-    max_possible_months = (end_date.year - start_dt.year) * 12 + (end_date.month - start_dt.month) + 1
-    
-    for m in range(2, max_possible_months + 1):
-        # The "logarithmic decay": fast at first, slow later
-        drop_prob = 0.15 / (1 + np.log(m-1)) 
-        # This mimics real-life behavior where a donor is most likely to quit early on, but if they stay for a long time, their chance of leaving each month becomes much smaller
-        if random.random() < drop_prob:
-            break # They cancelled!
-        months_stayed = m
-    
-    regular_donors.append({
-        'contact_id': cid,
-        'start_date': start_dt,
-        'months': months_stayed,
-        'amount': random.choice(list(range(10, 105, 5)))
-    })
+# Roll every month for every donor at once. Donors stay until their first cancellation roll
+kept = np.random.random((num_regular, len(drop_prob))) >= drop_prob
+months_survived = np.where(kept.all(axis=1), len(drop_prob), np.argmin(kept, axis=1))
+months_stayed = 1 + np.minimum(months_survived, max_possible_months - 1) # Add 1 for the first month donors give
 
-# Convert to a data frame to verify
-df_regular_donors = pd.DataFrame(regular_donors)
+# Create regular donor records from typed column arrays
+df_regular_donors = pd.DataFrame({
+    'contact_id': regular_contact_ids,
+    'start_date': month_options[chosen_start_points].astype('datetime64[ns]'), # The first-gift date is the 1st of the start month
+    'months': months_stayed,
+    'amount': np.random.choice(np.arange(10, 105, 5), size=num_regular)
+})
 
 print(f"Total Regular Donors processed: {len(df_regular_donors)}")
 
 # Visualize monthly regular donor acquisitions
-df_regular_donors['start_date'].apply(lambda x: x.month).value_counts().sort_index().plot(kind='bar', color='#264653')
+df_regular_donors['start_date'].dt.month.value_counts().sort_index().plot(kind='bar', color='#264653')
 plt.title("Monthly Regular Donor Acquisitions", pad=20)
 plt.xlabel("Month")
 plt.ylabel("Number of Donors")
@@ -147,28 +132,25 @@ plt.show()
 plt.close()
 
 # --- Generate Regular Donation Transaction Records ---
-rg_transactions = [] # Initialize an rg_transactions list
 
-for donor in regular_donors:
-    
-    for m in range(donor['months']):
-        # Increment month
-        tx_date = donor['start_date'] + pd.DateOffset(months=m)
-
-        if tx_date.date() <= end_date:
-            # Generate the ID based on how many items are already in the list
-            unique_id = f"006_REG_{str(len(rg_transactions)).zfill(8)}" # "006" at the beginning imitates Salesforce Opportunity IDs
-
-            rg_transactions.append({
-                'opportunity_id': unique_id,
-                'contact_id': donor['contact_id'],
-                'close_date': tx_date.date(),
-                'amount': donor['amount'],
-                'stage': 'Closed Won',
-                'type': 'Regular'
-            })
-
-df_rg = pd.DataFrame(rg_transactions)
+# Expand every regular donor into one row per month they gave
+months_arr = df_regular_donors['months'].to_numpy()
+month_offsets = np.arange(months_arr.sum()) - np.repeat(np.cumsum(months_arr) - months_arr, months_arr) # 0, 1, ..., months-1 for each donor
+start_months = df_regular_donors['start_date'].to_numpy().astype('datetime64[M]')
+tx_months = np.repeat(start_months, months_arr) + month_offsets.astype('timedelta64[M]') # Increment month
+
+# Keep transactions up to the very end (31 Dec 2025)
+in_range = tx_months <= np.datetime64(end_date, 'M')
+num_rg = in_range.sum()
+
+df_rg = pd.DataFrame({
+    'opportunity_id': np.char.add("006_REG_", np.char.zfill(np.arange(num_rg).astype(str), 8)), # "006" at the beginning imitates Salesforce Opportunity IDs
+    'contact_id': np.repeat(df_regular_donors['contact_id'].to_numpy(), months_arr)[in_range],
+    'close_date': tx_months[in_range].astype('datetime64[ns]'),
+    'amount': np.repeat(df_regular_donors['amount'].to_numpy(), months_arr)[in_range],
+    'stage': 'Closed Won',
+    'type': 'Regular'
+})
 
 print(df_rg.head())
 
@@ -178,24 +160,10 @@ print(df_rg.head())
 au_seasonal_weights = [1.0, 0.8, 1.0, 1.2, 3.5, 5.0, 1.2, 1.0, 1.1, 1.5, 4.0, 6.0]
 # Higher weights for May/June and November/December correspond to Tax and Christmas Appeals, respectively
 
-def get_weighted_random_date(year):
-    """Returns a date within the year based on AU seasonal peaks."""
-    month = np.random.choice(range(1, 13), p=np.array(au_seasonal_weights)/sum(au_seasonal_weights))
-    
-    # Handle month lengths. Ignore leap years
-    if month == 2:
-        day = random.randint(1, 28)
-    elif month in [4, 6, 9, 11]:
-        day = random.randint(1, 30)
-    else:
-        day = random.randint(1, 31)
-        
-    return date(year, month, day)
-
-# Define rounding logic
-def round_amount(amount, base):
-    """Rounds an amount and returns an integer that is a multiple of the base number"""
-    return int(base * round(amount/base))
+au_seasonal_p = np.array(au_seasonal_weights) / sum(au_seasonal_weights)
+
+# Handle month lengths. Ignore leap years
+days_in_month = np.array([31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31])
 
 # Generate transaction records for one-off gifts
 def generate_segmented_donations(total_target, df_contacts, existing_count):
@@ -203,62 +171,58 @@ def generate_segmented_donations(total_target, df_contacts, existing_count):
     
     remaining_n = total_target - existing_count
     
-    donations = [] # Initialize a donations list
-    
-    # Pre-map the major donor status for speed
-    major_map = df_contacts.set_index('contact_id')['is_major'].to_dict()
-
-    # Get a list of contact IDs
-    contact_ids = df_contacts["contact_id"].tolist()
+    # Get the contact ID codes, and the major donor status of each contact indexed by its code
+    contact_codes = df_contacts["contact_id"].cat.codes.to_numpy()
+    major_arr = np.zeros(len(contact_codes), dtype=bool)
+    major_arr[contact_codes] = df_contacts["is_major"].to_numpy(dtype=bool)
     
     # Activity weights (same as before)
-    donor_activity_weights = np.random.pareto(2.0, len(contact_ids)) + 1 # Add +1 at the end to ensure that no one has a zero weight
+    donor_activity_weights = np.random.pareto(2.0, len(contact_codes)) + 1 # Add +1 at the end to ensure that no one has a zero weight
     donor_activity_weights /= sum(donor_activity_weights)
 
-    for i in range(remaining_n):
-        donor_id = np.random.choice(contact_ids, p=donor_activity_weights) # Pick a donor
-        year = random.choice(years) # Pick a year
-        close_date = get_weighted_random_date(year)
-        
-        # Check if this donor is 'Major'
-        if major_map[donor_id]:
-            # --- Major Donor Logic ---
-            # Lower alpha (1.2) = More extreme variance
-            # Offset (+1000) = Minimum major gift is $1k
-            amount = np.random.pareto(a=1.2) * 500 + 1000
-            # Cap at $50k so one person doesn't ruin the charity's budget!
-            if amount > 50000: amount = np.random.uniform(20000, 50000)
-        else:
-            # --- General Donor Logic ---
-            # Higher alpha (3.0) = Tighter, more predictable gifts
-            amount = np.random.pareto(a=3.0) * 75 + 25
-            if amount > 1000: amount = np.random.uniform(500, 1000)
-
-        # Rounding logic
-        if amount >= 1000:
-            amount = round_amount(amount, 500)
-        elif amount >= 100:
-            amount = round_amount(amount, 50)
-        else:
-            amount = round_amount(amount, 5)
-
-        donations.append({
-            'opportunity_id': f"006_GEN_{str(i).zfill(8)}",
-            'contact_id': donor_id,
-            'close_date': close_date,
-            'amount': amount,
-            'is_major_gift': major_map[donor_id], # Helpful for later analysis
-            'stage': 'Closed Won'
-        })
-    
-    return pd.DataFrame(donations)
+    # Draw every donor, year and date at once
+    donor_codes = np.random.choice(contact_codes, size=remaining_n, p=donor_activity_weights) # Pick the donors
+    years_arr = np.random.choice(years, size=remaining_n) # Pick the years
+    months_arr = np.random.choice(np.arange(1, 13), size=remaining_n, p=au_seasonal_p) # Pick the months based on AU seasonal peaks
+    days_arr = np.random.randint(1, days_in_month[months_arr - 1] + 1) # Pick a valid day in each month
+    close_dates = pd.to_datetime(pd.DataFrame({'year': years_arr, 'month': months_arr, 'day': days_arr}))
+
+    # Check which donors are 'Major'
+    major_flags = major_arr[donor_codes]
+
+    # --- Major Donor Logic ---
+    # Lower alpha (1.2) = More extreme variance
+    # Offset (+1000) = Minimum major gift is $1k
+    major_amounts = np.random.pareto(1.2, remaining_n) * 500 + 1000
+    # Cap at $50k so one person doesn't ruin the charity's budget!
+    major_amounts = np.where(major_amounts > 50000, np.random.uniform(20000, 50000, remaining_n), major_amounts)
+
+    # --- General Donor Logic ---
+    # Higher alpha (3.0) = Tighter, more predictable gifts
+    general_amounts = np.random.pareto(3.0, remaining_n) * 75 + 25
+    general_amounts = np.where(general_amounts > 1000, np.random.uniform(500, 1000, remaining_n), general_amounts)
+
+    amounts = np.where(major_flags, major_amounts, general_amounts)
+
+    # Rounding logic: round each amount to a multiple of its tier's base number
+    base = np.where(amounts >= 1000, 500, np.where(amounts >= 100, 50, 5))
+    amounts = (base * np.round(amounts / base)).astype(np.int64)
+
+    return pd.DataFrame({
+        'opportunity_id': np.char.add("006_GEN_", np.char.zfill(np.arange(remaining_n).astype(str), 8)),
+        'contact_id': df_contacts["contact_id"].cat.categories[donor_codes], # Map the codes back to contact IDs
+        'close_date': close_dates,
+        'amount': amounts,
+        'is_major_gift': major_flags, # Helpful for later analysis
+        'stage': 'Closed Won'
+    })
 
-df_adhoc = generate_segmented_donations(50000, df_contacts, len(rg_transactions))
+df_adhoc = generate_segmented_donations(50000, df_contacts, len(df_rg))
 
 print(df_adhoc.info())
 
 # Visualize monthly one-off donations
-df_adhoc['close_date'].apply(lambda x: x.month).value_counts().sort_index().plot(kind="bar", color='#264653')
+df_adhoc['close_date'].dt.month.value_counts().sort_index().plot(kind="bar", color='#264653')
 plt.title("Monthly One-off Donations", pad=20)
 plt.xlabel("Month")
 plt.ylabel("Number of Donors")
@@ -266,62 +230,60 @@ plt.ylabel("Number of Donors")
 plt.show()
 plt.close()
 
-# Combine df_rg and df_adhoc
-df_opps = pd.concat([df_rg, df_adhoc]).reset_index(drop=True)
+# Combine df_rg and df_adhoc column by column, filling in the column each one lacks
+rg_cols = {col: df_rg[col].to_numpy() for col in df_rg.columns}
+rg_cols['is_major_gift'] = np.zeros(len(df_rg), dtype=bool) # Regular gifts are never major gifts
+
+adhoc_cols = {col: df_adhoc[col].to_numpy() for col in df_adhoc.columns}
+adhoc_cols['type'] = np.full(len(df_adhoc), 'Ad-hoc', dtype=object)
+
+opps_cols = ['opportunity_id', 'contact_id', 'close_date', 'amount', 'stage', 'type', 'is_major_gift']
+df_opps = pd.DataFrame({col: np.concatenate([rg_cols[col], adhoc_cols[col]]) for col in opps_cols})
 
 print(df_opps.info())
 print(df_opps.head())
 
 # --- Adding campaigns ---
-def assign_campaign(row, unsolicited_random_indices):
-    # 1. Regular Giving (Highest Priority)
-    if row['type'] == 'Regular':
-        return 'Regular Giving'
-    
-    # 2. Random 5% Unsolicited
-    if row.name in unsolicited_random_indices:
-        return 'Unsolicited'
-    
-    # 3. Major Giving
-    if row['is_major_gift'] == True:
-        return 'Major Giving'
-    
-    # Date-based logic for the rest
-    d = row['close_date']
-    m, day = d.month, d.day
-    
-    # 4. Tax Appeal: 1 May to 15 July
-    if (m == 5) or (m == 6) or (m == 7 and day <= 15):
-        return 'Tax Appeal'
-    
-    # 5. Christmas Appeal: 1 Nov to 15 Jan
-    if (m == 11) or (m == 12) or (m == 1 and day <= 15):
-        return 'Christmas Appeal'
-    
-    # 6. Spring Newsletter: 16 Sep to 15 Oct
-    if (m == 9 and day >= 16) or (m == 10 and day <= 15):
-        return 'Spring Newsletter'
-    
-    # 7. Autumn Newsletter: 16 Mar to 15 Apr
-    if (m == 3 and day >= 16) or (m == 4 and day <= 15):
-        return 'Autumn Newsletter'
-    
-    # 8. Remaining Unsolicited
-    return 'Unsolicited'
 
 # Pre-select the 5% random indices for Step 2 
 non_regular_indices = df_opps[df_opps['type'] != 'Regular'].index # Excluding regular donors so I don't overwrite them
 unsolicited_sample_size = int(len(df_opps) * 0.05)
 unsolicited_indices = np.random.choice(non_regular_indices, unsolicited_sample_size, replace=False)
 
-# Apply the function
-df_opps['campaign'] = df_opps.apply(
-    lambda x: assign_campaign(x, unsolicited_indices), 
-    axis=1
-)
+# Extract the fields that the campaign rules depend on
+m = df_opps['close_date'].dt.month.to_numpy()
+day = df_opps['close_date'].dt.day.to_numpy()
+is_reg = (df_opps['type'] == 'Regular').to_numpy()
+is_major = (df_opps['is_major_gift'] == True).to_numpy()
+is_unsolicited = np.zeros(len(df_opps), dtype=bool)
+is_unsolicited[unsolicited_indices] = True
+
+# Assign campaigns from the lowest to the highest priority, so higher priorities overwrite lower ones
+# 8. Remaining Unsolicited
+campaign = np.full(len(df_opps), 'Unsolicited', dtype=object)
+
+# 7. Autumn Newsletter: 16 Mar to 15 Apr
+campaign[((m == 3) & (day >= 16)) | ((m == 4) & (day <= 15))] = 'Autumn Newsletter'
+
+# 6. Spring Newsletter: 16 Sep to 15 Oct
+campaign[((m == 9) & (day >= 16)) | ((m == 10) & (day <= 15))] = 'Spring Newsletter'
+
+# 5. Christmas Appeal: 1 Nov to 15 Jan
+campaign[(m == 11) | (m == 12) | ((m == 1) & (day <= 15))] = 'Christmas Appeal'
+
+# 4. Tax Appeal: 1 May to 15 July
+campaign[(m == 5) | (m == 6) | ((m == 7) & (day <= 15))] = 'Tax Appeal'
+
+# 3. Major Giving
+campaign[is_major] = 'Major Giving'
+
+# 2. Random 5% Unsolicited
+campaign[is_unsolicited] = 'Unsolicited'
+
+# 1. Regular Giving (Highest Priority)
+campaign[is_reg] = 'Regular Giving'
 
-# Replace NaN in the is_major_gift column with False
-df_opps["is_major_gift"] = df_opps["is_major_gift"].astype("boolean").fillna(False)
+df_opps['campaign'] = campaign
 
 print(df_opps.info())
 print(df_opps.head())
@@ -331,17 +293,19 @@ print(df_opps.head())
 
 # Group by contact_id to find the total amount to date
 donor_summary = df_opps.groupby('contact_id')['amount'].sum().reset_index()
-donor_summary = donor_summary.sort_values(by='amount', ascending=False)
 
-# Calculate cumulative percentages
-total_revenue = donor_summary['amount'].sum()
-donor_summary['percent_revenue'] = (donor_summary['amount'].cumsum() / total_revenue) * 100
+# Sort donors from the highest to the lowest total once, and calculate cumulative percentages
+amounts = donor_summary['amount'].to_numpy()
+order = np.argsort(-amounts, kind='stable')
+sorted_amounts = amounts[order]
+donor_summary = donor_summary.iloc[order].assign(percent_revenue=sorted_amounts.cumsum() / sorted_amounts.sum() * 100)
 
 # Create a Pareto chart
 
-# Create decimal groups
+# Create decimal groups by splitting the already-sorted donors into tenths (the first tenth is the Top 10%)
 decile_labels = ["Bottom 10%", "80-90%", "70-80%", "60-70%", "50-60%", "40-50%", "30-40%", "20-30%", "10-20%", "Top 10%"]
-donor_summary['decile_group'] = pd.qcut(donor_summary['amount'], q=10, labels=decile_labels)
+decile_sizes = [len(chunk) for chunk in np.array_split(sorted_amounts, 10)]
+donor_summary['decile_group'] = pd.Categorical.from_codes(np.repeat(np.arange(9, -1, -1), decile_sizes), categories=decile_labels, ordered=True)
 
 print(donor_summary.head())
 
@@ -3,7 +3,6 @@ import pandas as pd
 import numpy as np
 from faker import Faker
 from datetime import date
-import random
 import matplotlib.pyplot as plt
 
 # Instantiate Faker
@@ -11,8 +10,7 @@ fake = Faker()
 
 # Set seed for reproducibility
 Faker.seed(42) 
-random.seed(42)
-np.random.seed(42)
+rng = np.random.default_rng(42) # One local generator for every NumPy draw
 
 # Configuration
 num_contacts = 5000
@@ -21,38 +19,49 @@ start_date = date(2016, 1, 1) # January 1, 2021 in the original dataset
 end_date = date(2025, 12, 31)
 years = list(range(start_date.year, end_date.year + 1, 1))
 
+# Columns with a small fixed vocabulary are stored as categories
+gender_dtype = pd.CategoricalDtype(['F', 'M', 'Non-binary'])
+stage_dtype = pd.CategoricalDtype(['Closed Won'])
+type_dtype = pd.CategoricalDtype(['Regular', 'Ad-hoc'])
+campaign_categories = ['Regular Giving', 'Unsolicited', 'Major Giving', 'Tax Appeal', 'Christmas Appeal', 'Spring Newsletter', 'Autumn Newsletter']
+
+# Contacts are carried through the script as int32 positions (contact_idx)
+# The "003" + 12-digit contact IDs are only formatted when a data frame is built
+def format_contact_ids(contact_idx):
+    """Returns the contact ID string for each 0-based contact position"""
+    return np.char.add("003", np.char.zfill((contact_idx + 1).astype(str), 12))
+
 # --- Create Contacts ---
 def generate_contacts_with_signals(n):
     """Generate a contact dataframe with age signals"""
 
-    contacts = [] # Initialize a contacts list
-    
-    for i in range(n):
-
-        # Generate basic demographics
-        age = random.randint(18, 90)
-        gender = np.random.choice(['F', 'M', 'Non-binary'], p=[0.52, 0.45, 0.03])
-        name = fake.name_male() if gender == 'M' else fake.name_female() if gender == 'F' else fake.name_nonbinary()
-        
-        # Bake in the signal:
-        # Make "Major Donor" status dependent on age
-        major_prob = 0.001 + (age / 100) * 0.05
-        is_major = random.random() < major_prob
-        
-        # Make "Regular Donor" status inversely dependent on age
-        reg_prob = 0.40 - (age / 100) * 0.30
-        is_regular = random.random() < reg_prob
-
-        contacts.append({
-            'contact_id': f"003{str(i+1).zfill(12)}",
-            'age': age,
-            'gender': gender,
-            'name': name,
-            'is_major': is_major,
-            'is_regular': is_regular
-        })
-
-    return pd.DataFrame(contacts)
+    # Generate basic demographics for everyone at once
+    ages = rng.integers(18, 91, size=n)
+    genders = rng.choice(['F', 'M', 'Non-binary'], size=n, p=[0.52, 0.45, 0.03])
+
+    # Generate the names in one batch per gender, then put them back in place
+    names = np.empty(n, dtype=object)
+    for gender, name_generator in [('F', fake.name_female), ('M', fake.name_male), ('Non-binary', fake.name_nonbinary)]:
+        is_gender = genders == gender
+        names[is_gender] = [name_generator() for _ in range(is_gender.sum())]
+
+    # Bake in the signal:
+    # Make "Major Donor" status dependent on age
+    major_prob = 0.001 + (ages / 100) * 0.05
+    is_major = rng.random(n) < major_prob
+
+    # Make "Regular Donor" status inversely dependent on age
+    reg_prob = 0.40 - (ages / 100) * 0.30
+    is_regular = rng.random(n) < reg_prob
+
+    return pd.DataFrame({
+        'contact_id': format_contact_ids(np.arange(n, dtype=np.int32)),
+        'age': ages.astype(np.int8), # 18-90 fits comfortably in int8
+        'gender': pd.Categorical(genders, dtype=gender_dtype),
+        'name': names,
+        'is_major': is_major,
+        'is_regular': is_regular
+    })
 
 df_contacts = generate_contacts_with_signals(num_contacts)
 
@@ -69,56 +78,40 @@ all_months_weights = monthly_weights * len(years)
 # Convert weights to probabilities
 probabilities = np.array(all_months_weights) / sum(all_months_weights)
 
-# Create a list of all possible (Year, Month) starting points
+# Create an array of all possible (Year, Month) starting points
+month_options = np.arange(np.datetime64(f"{years[0]}-01"), np.datetime64(f"{years[-1]}-12") + 1)
 
-month_options = [] # Initialize a month_options list
-
-for year in years:
-    for month in range(1, 13):
-        month_options.append((year, month))
-
-# Get a list and number of regular donor IDs
-regular_contact_ids = df_contacts[df_contacts['is_regular'] == True]['contact_id'].tolist()
-num_regular = len(regular_contact_ids)
+# Get an array and number of regular donor positions
+regular_contact_idx = np.flatnonzero(df_contacts['is_regular'].to_numpy()).astype(np.int32)
+num_regular = len(regular_contact_idx)
 
 # Assign a start month to every single regular donor at once
-chosen_start_points = np.random.choice(len(month_options), size=num_regular, p=probabilities)
-
-# Create regular donor records
-regular_donors = [] # Initialize a regular_donors list
+chosen_start_points = rng.choice(len(month_options), size=num_regular, p=probabilities)
 
-for i, start_idx in enumerate(chosen_start_points):
+# Calculate the number of months left between each start and the very end (31 Dec 2025)
+max_possible_months = len(month_options) - chosen_start_points
 
-    cid = regular_contact_ids[i] # Pick a donor
-    year, month = month_options[start_idx] # Pick the first-gift month
-    start_dt = date(year, month, 1) # Pick the first-gift date
-    
-    months_stayed = 1 # Initialize to 1 (the first month donors give)
+# The "logarithmic decay": fast at first, slow later
+# drop_prob[m-2] is the chance of cancelling in month m (m = 2, 3, ...)
+drop_prob = 0.15 / (1 + np.log(np.arange(1, len(month_options))))
 
-    # Calculate the number of months left between start and the very end (31 Dec 2025)
-    max_possible_months = (end_date.year - start_dt.year) * 12 + (end_date.month - start_dt.month) + 1 # Add 1 at the end
-    
-    for m in range(2, max_possible_months + 1):
-        # The "logarithmic decay": fast at first, slow later
-        drop_prob = 0.15 / (1 + np.log(m-1)) 
-        if random.random() < drop_prob:
-            break # They cancelled!
-        months_stayed = m
-    
-    regular_donors.append({
-        'contact_id': cid,
-        'start_date': start_dt,
-        'months': months_stayed,
-        'amount': random.choice(list(range(10, 105, 5)))
-    })
+# Roll every month for every donor at once. Donors stay until their first cancellation roll
+kept = rng.random((num_regular, len(drop_prob))) >= drop_prob
+months_survived = np.where(kept.all(axis=1), len(drop_prob), np.argmin(kept, axis=1))
+months_stayed = 1 + np.minimum(months_survived, max_possible_months - 1) # Add 1 for the first month donors give
 
-# Convert to a data frame to verify
-df_regular_donors = pd.DataFrame(regular_donors)
+# Create regular donor records from typed column arrays
+df_regular_donors = pd.DataFrame({
+    'contact_id': format_contact_ids(regular_contact_idx),
+    'start_date': month_options[chosen_start_points].astype('datetime64[ns]'), # The first-gift date is the 1st of the start month
+    'months': months_stayed,
+    'amount': rng.choice(np.arange(10, 105, 5), size=num_regular).astype(np.int32)
+})
 
 print(f"Total Regular Donors processed: {len(df_regular_donors)}")
 
 # Visualize monthly regular donor acquisitions
-df_regular_donors['start_date'].apply(lambda x: x.month).value_counts().sort_index().plot(kind='bar', color="#264653")
+df_regular_donors['start_date'].dt.month.value_counts().sort_index().plot(kind='bar', color="#264653")
 plt.title("Monthly Regular Donor Acquisitions", pad=20)
 plt.xlabel("Month")
 plt.ylabel("Number of Donors")
@@ -128,28 +121,25 @@ plt.close()
 
 # --- Generate Regular Donation Transaction Records ---
 
-rg_transactions = [] # Initialize an rg_transactions list
-
-for donor in regular_donors:
-    
-    for m in range(donor['months']):
-        # Increment month
-        tx_date = donor['start_date'] + pd.DateOffset(months=m)
-
-        if tx_date.date() <= end_date:
-            # Generate the ID based on how many items are already in the list
-            unique_id = f"006_REG_{str(len(rg_transactions)).zfill(8)}"
-
-            rg_transactions.append({
-                'opportunity_id': unique_id,
-                'contact_id': donor['contact_id'],
-                'close_date': tx_date.date(),
-                'amount': donor['amount'],
-                'stage': 'Closed Won',
-                'type': 'Regular'
-            })
-
-df_rg = pd.DataFrame(rg_transactions)
+# Expand every regular donor into one row per month they gave
+months_arr = df_regular_donors['months'].to_numpy()
+month_offsets = np.arange(months_arr.sum()) - np.repeat(np.cumsum(months_arr) - months_arr, months_arr) # 0, 1, ..., months-1 for each donor
+start_months = df_regular_donors['start_date'].to_numpy().astype('datetime64[M]')
+tx_months = np.repeat(start_months, months_arr) + month_offsets.astype('timedelta64[M]') # Increment month
+
+# Keep transactions up to the very end (31 Dec 2025)
+in_range = tx_months <= np.datetime64(end_date, 'M')
+num_rg = in_range.sum()
+
+df_rg = pd.DataFrame({
+    'opportunity_id': np.char.add("006_REG_", np.char.zfill(np.arange(num_rg).astype(str), 8)),
+    'contact_id': format_contact_ids(np.repeat(regular_contact_idx, months_arr)[in_range]),
+    'close_date': tx_months[in_range].astype('datetime64[ns]'),
+    'amount': np.repeat(df_regular_donors['amount'].to_numpy(), months_arr)[in_range],
+    'stage': pd.Categorical(np.full(num_rg, 'Closed Won'), dtype=stage_dtype),
+    'type': pd.Categorical(np.full(num_rg, 'Regular'), dtype=type_dtype),
+    'is_major_gift': np.zeros(num_rg, dtype=bool) # Regular gifts are never major gifts
+})
 
 print(df_rg.head())
 
@@ -158,189 +148,168 @@ print(df_rg.head())
 # Configure seasonality
 au_seasonal_weights = [1.0, 0.8, 1.0, 1.2, 3.5, 5.0, 1.2, 1.0, 1.1, 1.5, 4.0, 6.0]
 
-def get_weighted_random_date(year):
-    """Returns a date within the year based on AU seasonal peaks."""
-    month = np.random.choice(range(1, 13), p=np.array(au_seasonal_weights)/sum(au_seasonal_weights))
-    
-    # Handle month lengths. Ignore leap years
-    if month == 2:
-        day = random.randint(1, 28)
-    elif month in [4, 6, 9, 11]:
-        day = random.randint(1, 30)
-    else:
-        day = random.randint(1, 31)
-        
-    return date(year, month, day)
+# Cumulative seasonal weights, so a month can be sampled with searchsorted on a uniform draw
+au_seasonal_cum = np.cumsum(au_seasonal_weights)
+au_seasonal_cum /= au_seasonal_cum[-1]
 
-# Define rounding logic
-def round_amount(amount, base):
-    """Rounds an amount and returns an integer that is a multiple of the base number"""
-    return int(base * round(amount/base))
+# Month lengths for the batched date draws. Ignore leap years
+days_in_month = np.array([31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31])
+
+def get_weighted_random_dates(years_arr):
+    """Returns a date within each given year based on AU seasonal peaks."""
+    months = np.searchsorted(au_seasonal_cum, rng.random(len(years_arr)), side='right') + 1
+    days = rng.integers(1, days_in_month[months - 1] + 1) # Handle month lengths
+    return pd.to_datetime(pd.DataFrame({'year': years_arr, 'month': months, 'day': days})).to_numpy().astype('datetime64[D]')
 
 # Assign acquisition years to spread the 5,000 contacts across all years
-contact_ids = df_contacts["contact_id"].tolist()
-acq_date = {cid: get_weighted_random_date(np.random.choice(years)) for cid in contact_ids}
+# Acquisition dates are stored by contact position
+acq_date_arr = get_weighted_random_dates(rng.choice(years, size=num_contacts))
+end_date64 = np.datetime64(end_date)
 
-# Expand the pool of people capable of giving more than once
+# Expand the pool of people capable of giving more than once (stored as contact positions)
 repeat_pool_size = int(num_contacts * 0.45)
-repeat_donor_ids = np.random.choice(contact_ids, size=repeat_pool_size, replace=False)
+repeat_donor_idx = rng.choice(num_contacts, size=repeat_pool_size, replace=False).astype(np.int32)
 
-repeat_loyalty_weights = np.random.pareto(a=12.0, size=repeat_pool_size)
+repeat_loyalty_weights = rng.pareto(a=12.0, size=repeat_pool_size)
 repeat_loyalty_weights /= repeat_loyalty_weights.sum()
 
+# The fix for the 2024 Spike: Use "Relative Age" weights
+# Weight of giving again by years since the first gift: 10 in the same year, 5 in Year 1,
+# 2 in Year 2, then 0.5 for the "Long Tail" of Legacy propensity
+loyalty_year_weights = np.array([10, 5, 2] + [0.5] * (len(years) - 3))
+
+# Normalised cumulative weights for each first-gift year, covering only the years left in the charity's life
+loyalty_year_cum = {}
+for i in range(len(years)):
+    remaining_weights = loyalty_year_weights[:len(years) - i]
+    loyalty_year_cum[i] = np.cumsum(remaining_weights) / remaining_weights.sum()
+
 def generate_segmented_donations_fix3(target_n, df_contacts):
     
     """Generates transaction records for one-off gifts, segmented by donor type"""
-    
-    donations = [] # Initialize a donations list
-
-    # Pre-map the major donor status for speed
-    major_map = df_contacts.set_index('contact_id')['is_major'].to_dict()
-
-    for i in range(target_n):
-
-        # Determiine donor and date
-        if i < num_contacts: # Acquisition logic
-            donor_id = contact_ids[i]
-            close_date = acq_date[donor_id]
-        else: # Loyalty/Repeat logic
-            # For the remaining gifts, use the loyalty weights - Only pick the 30% who are capable of repeating
-            donor_id = np.random.choice(repeat_donor_ids, p=repeat_loyalty_weights)
-
-            # Calculate how many years are left in the charity's life
-            first_year = acq_date[donor_id].year
-            years_remaining = [y for y in years if y >= first_year]
-
-            # The fix for the 2024 Spike: Use "Relative Age" weights
-            # Probability depends on how many years it has been since their first gift
-            weights = []
-
-            for y in years_remaining:
-                years_since_acq = y - first_year
-                if years_since_acq == 0:
-                    weights.append(10) # High chance to give again in the same year
-                elif years_since_acq == 1:
-                    weights.append(5)  # Moderate chance in Year 1
-                elif years_since_acq == 2:
-                    weights.append(2)  # Lower chance in Year 2
-                else:
-                    weights.append(0.5) # The "Long Tail" for Legacy propensity
-
-            weights = np.array(weights) / sum(weights) # Normalize
-
-            # Pick the year using these weights
-            close_year = np.random.choice(years_remaining, p=weights)
-
-            # Proceed with your seasonal logic
-            close_date = get_weighted_random_date(close_year)
-
-            # Calculate the number of days between acquisition and the end of 2025 - Determine the window of opportunity
-            contact_start_date = pd.to_datetime(acq_date[donor_id])
-            contact_end_date = pd.to_datetime(end_date)
-            days_diff = (contact_end_date - contact_start_date).days
-
-            # # Date Safety Catch
-            # If the seasonal date falls before acquisition, pick a random day in their remaining "tenure"
-            if pd.to_datetime(close_date) < contact_start_date:
-                if days_diff > 0:
-                    # Pick any day between day 1 and end_date
-                    random_days = random.randint(1, days_diff)
-                    close_date = contact_start_date + pd.Timedelta(days=random_days)
-                else:
-                    # For donors joined on the very last day
-                    close_date = contact_start_date
-
-        # Check if this donor is 'Major'
-        if major_map[donor_id]:
-            # --- Major Donor Logic ---
-            # Lower alpha (1.2) = More extreme variance
-            # Offset (+1000) = Minimum major gift is $1k
-            amount = np.random.pareto(a=1.2) * 500 + 1000
-            # Cap at $50k so one person doesn't ruin the charity's budget!
-            if amount > 50000: amount = np.random.uniform(20000, 50000)
-        else:
-            # --- General Donor Logic ---
-            # Higher alpha (3.0) = Tighter, more predictable gifts
-            amount = np.random.pareto(a=3.0) * 75 + 25
-            if amount > 1000: amount = np.random.uniform(500, 1000)
-
-        # Rounding logic
-        if amount >= 1000:
-            amount = round_amount(amount, 500)
-        elif amount >= 100:
-            amount = round_amount(amount, 50)
-        else:
-            amount = round_amount(amount, 5)
-
-        donations.append({
-            'opportunity_id': f"006_GEN_{str(i).zfill(8)}",
-            'contact_id': donor_id,
-            'close_date': close_date,
-            'amount': amount,
-            'is_major_gift': major_map[donor_id],
-            'stage': 'Closed Won'
-            })
-    
-    return pd.DataFrame(donations)
+
+    # Pre-draw both amount distributions for every gift in one call each; the donor type picks between them later
+    # Major donors: lower alpha (1.2) = More extreme variance. Offset (+1000) = Minimum major gift is $1k
+    major_draws = rng.pareto(1.2, target_n) * 500 + 1000
+    major_caps = rng.uniform(20000, 50000, target_n)
+    # General donors: higher alpha (3.0) = Tighter, more predictable gifts
+    general_draws = rng.pareto(3.0, target_n) * 75 + 25
+    general_caps = rng.uniform(500, 1000, target_n)
+
+    # Major donor status by contact position, for speed
+    is_major_arr = df_contacts['is_major'].to_numpy()
+
+    # Acquisition logic: the first num_contacts gifts are each contact's first gift, on their acquisition date
+    n_acq = min(target_n, num_contacts)
+    acq_idx = np.arange(n_acq, dtype=np.int32)
+
+    # Loyalty/Repeat logic: for the remaining gifts, use the loyalty weights - Only pick the 45% who are capable of repeating
+    n_loyalty = target_n - n_acq
+    loyalty_idx = rng.choice(repeat_donor_idx, size=n_loyalty, p=repeat_loyalty_weights)
+    contact_start_dates = acq_date_arr[loyalty_idx]
+    first_years = contact_start_dates.astype('datetime64[Y]').astype(int) + 1970
+
+    # Probability depends on how many years it has been since their first gift (see loyalty_year_cum)
+    close_years = np.empty(n_loyalty, dtype=int)
+
+    for first_year in np.unique(first_years):
+        cum_weights = loyalty_year_cum[first_year - years[0]]
+
+        # Pick the years for every donor acquired in first_year using these weights
+        in_group = first_years == first_year
+        close_years[in_group] = first_year + np.searchsorted(cum_weights, rng.random(in_group.sum()), side='right')
+
+    # Proceed with the seasonal logic
+    close_dates = get_weighted_random_dates(close_years)
+
+    # Calculate the number of days between acquisition and the end of 2025 - Determine the window of opportunity
+    days_diff = (end_date64 - contact_start_dates).astype(int)
+
+    # # Date Safety Catch
+    # If the seasonal date falls before acquisition, pick a random day in their remaining "tenure"
+    # (Pick any day between day 1 and end_date, or the acquisition date for donors joined on the very last day)
+    random_days = np.where(days_diff > 0, rng.integers(1, np.maximum(days_diff, 1) + 1), 0)
+    close_dates = np.where(close_dates < contact_start_dates, contact_start_dates + random_days * np.timedelta64(1, 'D'), close_dates)
+
+    donor_idx = np.concatenate([acq_idx, loyalty_idx])
+    all_close_dates = np.concatenate([acq_date_arr[acq_idx], close_dates]).astype('datetime64[ns]')
+
+    # Check which donors are 'Major'
+    major_flags = is_major_arr[donor_idx]
+
+    # --- Major Donor Logic ---
+    # Cap at $50k so one person doesn't ruin the charity's budget!
+    major_amounts = np.where(major_draws > 50000, major_caps, major_draws)
+
+    # --- General Donor Logic ---
+    general_amounts = np.where(general_draws > 1000, general_caps, general_draws)
+
+    amounts = np.where(major_flags, major_amounts, general_amounts)
+
+    # Rounding logic: round each amount to a multiple of its tier's base number
+    base = np.where(amounts >= 1000, 500, np.where(amounts >= 100, 50, 5))
+    amounts = (base * np.round(amounts / base)).astype(np.int32)
+
+    return pd.DataFrame({
+        'opportunity_id': np.char.add("006_GEN_", np.char.zfill(np.arange(target_n).astype(str), 8)),
+        'contact_id': format_contact_ids(donor_idx), # Format the contact IDs only when building the data frame
+        'close_date': all_close_dates,
+        'amount': amounts,
+        'stage': pd.Categorical(np.full(target_n, 'Closed Won'), dtype=stage_dtype),
+        'type': pd.Categorical(np.full(target_n, 'Ad-hoc'), dtype=type_dtype),
+        'is_major_gift': major_flags
+    })
 
 df_adhoc = generate_segmented_donations_fix3(num_adhoc_opps, df_contacts)
 print(df_adhoc.info())
 print(df_adhoc.head())
 
-# Combine df_rg and df_adhoc
-df_opps = pd.concat([df_rg, df_adhoc]).reset_index(drop=True)
+# Combine df_rg and df_adhoc column by column, so each column is copied once with no block consolidation
+opps_columns = {}
+for col in df_rg.columns:
+    if isinstance(df_rg[col].dtype, pd.CategoricalDtype):
+        # Both frames share the categorical dtype, so their codes can be stacked directly
+        opps_columns[col] = pd.Categorical.from_codes(np.concatenate([df_rg[col].cat.codes, df_adhoc[col].cat.codes]), dtype=df_rg[col].dtype)
+    else:
+        opps_columns[col] = np.concatenate([df_rg[col].to_numpy(), df_adhoc[col].to_numpy()])
+
+df_opps = pd.DataFrame(opps_columns)
 print(df_opps.head())
 
 
 # --- Adding campaigns ---
-def assign_campaign(row, unsolicited_random_indices):
-    # 1. Regular Giving (Highest Priority)
-    if row['type'] == 'Regular':
-        return 'Regular Giving'
-    
-    # 2. Random 5% Unsolicited
-    if row.name in unsolicited_random_indices:
-        return 'Unsolicited'
-    
-    # 3. Major Giving
-    if row['is_major_gift'] == True:
-        return 'Major Giving'
-    
-    # Date-based logic for the rest
-    d = row['close_date']
-    m, day = d.month, d.day
-    
-    # 4. Tax Appeal: 1 May to 15 July
-    if (m == 5) or (m == 6) or (m == 7 and day <= 15):
-        return 'Tax Appeal'
-    
-    # 5. Christmas Appeal: 1 Nov to 15 Jan
-    if (m == 11) or (m == 12) or (m == 1 and day <= 15):
-        return 'Christmas Appeal'
-    
-    # 6. Spring Newsletter: 16 Sep to 15 Oct
-    if (m == 9 and day >= 16) or (m == 10 and day <= 15):
-        return 'Spring Newsletter'
-    
-    # 7. Autumn Newsletter: 16 Mar to 15 Apr
-    if (m == 3 and day >= 16) or (m == 4 and day <= 15):
-        return 'Autumn Newsletter'
-    
-    # 8. Remaining Unsolicited
-    return 'Unsolicited'
 
 # Pre-select the 5% random indices for Step 2 
 non_regular_indices = df_opps[df_opps['type'] != 'Regular'].index # Excluding regular donors so I don't overwrite them
 unsolicited_sample_size = int(len(df_opps) * 0.05)
-unsolicited_indices = np.random.choice(non_regular_indices, unsolicited_sample_size, replace=False)
-
-# Apply the function
-df_opps['campaign'] = df_opps.apply(
-    lambda x: assign_campaign(x, unsolicited_indices), 
-    axis=1
+unsolicited_indices = rng.choice(non_regular_indices, unsolicited_sample_size, replace=False)
+
+# Extract the fields that the campaign rules depend on
+m = df_opps['close_date'].dt.month.to_numpy()
+d = df_opps['close_date'].dt.day.to_numpy()
+is_reg = (df_opps['type'] == 'Regular').to_numpy()
+is_major = df_opps['is_major_gift'].to_numpy()
+is_unsolicited = np.zeros(len(df_opps), dtype=bool)
+is_unsolicited[unsolicited_indices] = True
+is_unsolicited &= ~is_reg
+
+# np.select picks the first rule that matches, so the rules are listed in priority order
+# It selects category codes, so the campaign column never holds Python strings
+campaign_rules = [
+    (is_reg, 'Regular Giving'),                                              # 1. Regular Giving (Highest Priority)
+    (is_unsolicited, 'Unsolicited'),                                         # 2. Random 5% Unsolicited
+    (is_major, 'Major Giving'),                                              # 3. Major Giving
+    ((m == 5) | (m == 6) | ((m == 7) & (d <= 15)), 'Tax Appeal'),            # 4. Tax Appeal: 1 May to 15 July
+    ((m == 11) | (m == 12) | ((m == 1) & (d <= 15)), 'Christmas Appeal'),    # 5. Christmas Appeal: 1 Nov to 15 Jan
+    (((m == 9) & (d >= 16)) | ((m == 10) & (d <= 15)), 'Spring Newsletter'), # 6. Spring Newsletter: 16 Sep to 15 Oct
+    (((m == 3) & (d >= 16)) | ((m == 4) & (d <= 15)), 'Autumn Newsletter'),  # 7. Autumn Newsletter: 16 Mar to 15 Apr
+]
+
+campaign_codes = np.select(
+    [condition for condition, _ in campaign_rules],
+    [campaign_categories.index(campaign) for _, campaign in campaign_rules],
+    default=campaign_categories.index('Unsolicited') # 8. Remaining Unsolicited
 )
-
-# Replace NaN in the is_major_gift column with False
-df_opps["is_major_gift"] = df_opps["is_major_gift"].astype("boolean").fillna(False)
+df_opps['campaign'] = pd.Categorical.from_codes(campaign_codes, categories=campaign_categories)
 
 print(df_opps.head())
\ No newline at end of file